@@ -1,7 +1,20 @@
 import os
+import asyncio
+import functools
+import json
 import logging
-from flask import Flask, request, jsonify
+import logging.handlers
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import cachetools
+import orjson
+from quart import Quart, request, jsonify
+from quart.json.provider import JSONProvider
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # Load environment variables from a .env file
@@ -12,49 +25,304 @@ load_dotenv()
 LEMLIST_API_KEY = os.getenv('LEMLIST_API_KEY')
 CAMPAIGN_NAME = "website_leads"  # Fixed campaign name for RB2B leads
 
+# --- RB2B -> lemlist Field Mapping ---
+# Maps each lemlist field to the RB2B key variants it may arrive under,
+# in priority order. Precomputed once so the handler builds the payload
+# in a single pass that stops at the first alias present.
+FIELD_ALIASES = (
+    # Standard lemlist fields
+    ("firstName", ("FirstName", "First Name")),
+    ("lastName", ("LastName", "Last Name")),
+    ("linkedinUrl", ("LinkedIn URL", "LinkedInUrl")),
+    ("jobTitle", ("Title", "jobTitle")),
+    ("companyName", ("CompanyName", "Company Name")),
+    ("companyWebsite", ("Website", "companyWebsite")),
+    ("companyIndustry", ("Industry", "companyIndustry")),
+    ("companySize", ("EstimatedEmployeeCount", "Employee Count")),
+    ("city", ("City",)),
+    ("state", ("State",)),
+    # Custom fields for additional RB2B data
+    ("zipcode", ("Zipcode", "zipcode")),
+    ("estimatedRevenue", ("EstimateRevenue", "Estimate Revenue")),
+)
+
+
+def _compile_field_mapper():
+    """
+    Generates a payload mapper specialized to FIELD_ALIASES at import time.
+    The alias lookups are inlined as straight-line code, so each webhook
+    pays one function call and no Python-level iteration over the table.
+    """
+    lines = ["def _map_rb2b_fields(d):", "    g = d.get", "    p = {}"]
+    for lemlist_field, rb2b_keys in FIELD_ALIASES:
+        lines.append(f"    v = g({rb2b_keys[0]!r})")
+        for rb2b_key in rb2b_keys[1:]:
+            lines.append(f"    if v is None: v = g({rb2b_key!r})")
+        lines.append(f"    if v is not None: p[{lemlist_field!r}] = v")
+    lines.append("    return p")
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace['_map_rb2b_fields']
+
+
+# Maps an RB2B payload dict to a lemlist payload dict; see FIELD_ALIASES.
+_map_rb2b_fields = _compile_field_mapper()
+
 # --- Logging Setup ---
-# This fulfills the logging requirement from the BRD.
+# This fulfills the logging requirement from the BRD. Records are routed
+# through a queue so the file/console writes happen on a background
+# listener thread instead of on the request path.
+_LOG_QUEUE = queue.SimpleQueue()
+_LOG_FILE_HANDLER = logging.FileHandler("webhook_handler.log")  # Log to a file
+_LOG_STREAM_HANDLER = logging.StreamHandler()  # Log to console
+# The QueueHandler formats records at enqueue time (so timestamps are
+# accurate); the listener handlers emit the prepared message as-is.
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("webhook_handler.log"), # Log to a file
-        logging.StreamHandler() # Log to console
-    ]
+    handlers=[logging.handlers.QueueHandler(_LOG_QUEUE)]
 )
+_LOG_LISTENER = logging.handlers.QueueListener(
+    _LOG_QUEUE, _LOG_FILE_HANDLER, _LOG_STREAM_HANDLER
+)
+_LOG_LISTENER.start()
+
+logger = logging.getLogger(__name__)
+
+# --- Lemlist HTTP Session ---
+# A single pooled session reuses TCP/TLS connections to api.lemlist.com
+# instead of paying a fresh handshake on every webhook. Auth and headers
+# are set once here so individual calls don't need to repeat them.
+LEMLIST_SESSION = requests.Session()
+LEMLIST_SESSION.mount(
+    'https://',
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[429, 502, 503, 504],
+            # urllib3 excludes POST by default; lemlist lead creation is
+            # an upsert, so retrying the POSTs is safe.
+            allowed_methods=frozenset({"GET", "POST"})
+        )
+    )
+)
+# lemlist uses Basic Auth with EMPTY username and API key as password
+# This creates the format ":APIKEY" as required by lemlist docs
+LEMLIST_SESSION.auth = ('', LEMLIST_API_KEY)
+LEMLIST_SESSION.headers.update({"Content-Type": "application/json"})
+
+# Connect/read timeouts applied to every lemlist call
+LEMLIST_TIMEOUT = (3, 10)
+
+# --- Background Lead Queue ---
+# The webhook no longer blocks on the outbound lemlist call. Parsed and
+# mapped leads are queued here and a background batcher drains the queue,
+# so the inbound request returns as soon as the payload is accepted.
+# Leads are flushed in batches of up to BATCH_MAX_SIZE, or after
+# BATCH_MAX_WAIT seconds, whichever comes first, to amortize the
+# per-request overhead of talking to lemlist across many leads.
+LEAD_Q = queue.Queue(maxsize=10000)
+BATCH_MAX_SIZE = 100
+BATCH_MAX_WAIT = 1.0
+
+# lemlist has no bulk lead-creation endpoint, so a flush pipelines the
+# per-lead POSTs concurrently over the pooled session.
+FLUSH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="lead-flush")
+
+# --- Webhook Deduplication ---
+# RB2B retries webhooks, and re-POSTing the same lead to lemlist is
+# wasted work (and can error). Recently-seen emails are remembered for an
+# hour; duplicates return immediately without touching the lead queue.
+# TTLCache is not thread-safe, hence the lock.
+SEEN_EMAILS = cachetools.TTLCache(maxsize=100_000, ttl=3600)
+SEEN_LOCK = threading.Lock()
+
+
+def _deliver(item):
+    """Delivers one (email, payload) item to lemlist, logging failures."""
+    business_email, lemlist_payload = item
+    try:
+        _send_lead_to_lemlist(business_email, lemlist_payload)
+    except Exception as e:
+        logging.error(f"❌ Failed to deliver lead {business_email}: {e}")
+
+
+def _flush(items):
+    """Sends a batch of queued leads to lemlist in parallel."""
+    logging.info(f"🚚 Flushing batch of {len(items)} lead(s) to lemlist")
+    list(FLUSH_POOL.map(_deliver, items))
+
+
+def _batcher():
+    """
+    Drains LEAD_Q in batches: collects up to BATCH_MAX_SIZE items or waits
+    at most BATCH_MAX_WAIT seconds after the first item, then flushes.
+    """
+    while True:
+        items = [LEAD_Q.get()]
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        while len(items) < BATCH_MAX_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(LEAD_Q.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            _flush(items)
+        finally:
+            for _ in items:
+                LEAD_Q.task_done()
+
+
+def _drain_lead_queue():
+    """Flushes any queued leads before the process exits."""
+    items = []
+    while True:
+        try:
+            items.append(LEAD_Q.get_nowait())
+        except queue.Empty:
+            break
+    if items:
+        logging.info(f"Shutting down - draining {len(items)} queued lead(s)")
+        _flush(items)
 
-# --- Flask App Initialization ---
-app = Flask(__name__)
 
-# Global variable to store the campaign ID once found/created
-CAMPAIGN_ID = None
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, so request.get_json() and jsonify
+    use its Rust parser/serializer instead of the stdlib json module."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+# --- Quart App Initialization ---
+# Quart is the ASGI port of Flask: same routing/jsonify API, but views
+# are coroutines, so one event loop serves many in-flight requests
+# instead of one worker thread per request.
+app = Quart(__name__)
+app.json = OrjsonProvider(app)
+
+# Resolved campaign IDs are memoized in-process via functools.lru_cache
+# and persisted here (with the campaign-list ETag) so a restarted worker
+# can skip the campaign-list round-trip. The file is shared by all
+# gunicorn workers on the host, so only the first worker pays the lookup.
+# Entries older than the TTL are revalidated against lemlist.
+CAMPAIGN_CACHE_FILE = '.campaign_cache.json'
+CAMPAIGN_CACHE_TTL = 3600  # seconds
+
+
+def _load_campaign_cache(name):
+    """Returns the persisted cache entry for `name`, or None."""
+    try:
+        with open(CAMPAIGN_CACHE_FILE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('name') != name:
+        return None
+    return cached
+
+
+def _store_campaign_cache(name, campaign_id, etag=None):
+    """Persists a resolved campaign ID (and list ETag) so restarts skip the lookup."""
+    try:
+        with open(CAMPAIGN_CACHE_FILE, 'w') as f:
+            json.dump({
+                'name': name,
+                'id': campaign_id,
+                'etag': etag,
+                'cached_at': time.time()
+            }, f)
+    except OSError as e:
+        logging.warning(f"Could not persist campaign ID cache: {e}")
 
 
 def get_or_create_campaign():
     """
     Checks if the 'website_leads' campaign exists in lemlist.
     If it exists, returns its ID. If not, creates it and returns the new ID.
+    The result is memoized; see _campaign_id.
     """
-    global CAMPAIGN_ID
-    
-    if CAMPAIGN_ID:
-        return CAMPAIGN_ID
-    
+    return _campaign_id(CAMPAIGN_NAME)
+
+
+# Serializes cache misses: lru_cache does not, and the first flush fans
+# get_or_create_campaign() out across up to 8 FLUSH_POOL threads, which
+# on a cold start raced to POST duplicate "website_leads" campaigns
+# (lemlist campaign names are not unique).
+_CAMPAIGN_RESOLVE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _campaign_id(name):
+    """
+    Resolves the lemlist campaign ID for `name`, creating the campaign if
+    needed. Memoized per name; call _campaign_id.cache_clear() when lemlist
+    reports the cached campaign no longer exists.
+
+    Concurrent misses are serialized by _CAMPAIGN_RESOLVE_LOCK: losers
+    re-run the resolution after the winner, find the freshly persisted ID
+    (or the winner's campaign in the list), and never create a duplicate.
+    Separate gunicorn workers can still race on the very first boot of a
+    deployment, since each process has its own lock and the shared cache
+    file only exists once one worker has won.
+    """
+    with _CAMPAIGN_RESOLVE_LOCK:
+        return _resolve_campaign_id(name)
+
+
+def _resolve_campaign_id(name):
+    """Resolves `name` via the cache file, the campaign list, or a create."""
     # Check if API key is loaded
     if not LEMLIST_API_KEY:
         logging.error("LEMLIST_API_KEY is not set. Please check your .env file.")
         raise ValueError("Missing LEMLIST_API_KEY")
     
     logging.info(f"Using API key: {LEMLIST_API_KEY[:8]}..." if len(LEMLIST_API_KEY) > 8 else "API key too short")
-    # IMPORTANT: lemlist uses Basic Auth with EMPTY username and API key as password
-    # This creates the format ":APIKEY" as required by lemlist docs
-    auth = ('', LEMLIST_API_KEY)
-    
-    # 1. Try to get all campaigns and find 'website_leads'
+
+    # 1. Check the persisted cache from a previous run and validate the ID
+    cached = _load_campaign_cache(name)
+    cached_etag = cached.get('etag') if cached else None
+    cached_id = cached.get('id') if cached else None
+    cache_fresh = cached and time.time() - cached.get('cached_at', 0) <= CAMPAIGN_CACHE_TTL
+    if cached_id and cache_fresh:
+        try:
+            check = LEMLIST_SESSION.get(
+                f'https://api.lemlist.com/api/campaigns/{cached_id}',
+                timeout=LEMLIST_TIMEOUT
+            )
+            if check.status_code == 200:
+                logging.info(f"Using cached campaign ID for '{name}': {cached_id}")
+                return cached_id
+            logging.info(f"Cached campaign ID {cached_id} is no longer valid (status {check.status_code})")
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Could not validate cached campaign ID: {e}")
+
+    # 2. Try to get all campaigns and find one matching `name`. If we have
+    # an ETag from a previous list fetch, make the GET conditional: a 304
+    # means the list is unchanged and the cached ID is still good.
     try:
-        logging.info(f"Checking if campaign '{CAMPAIGN_NAME}' exists in lemlist...")
-        response = requests.get('https://api.lemlist.com/api/campaigns', auth=auth)
-        
+        logging.info(f"Checking if campaign '{name}' exists in lemlist...")
+        conditional_headers = {'If-None-Match': cached_etag} if cached_etag and cached_id else None
+        response = LEMLIST_SESSION.get(
+            'https://api.lemlist.com/api/campaigns',
+            headers=conditional_headers,
+            timeout=LEMLIST_TIMEOUT
+        )
+
+        if response.status_code == 304:
+            logging.info(f"Campaign list unchanged (304) - reusing cached ID: {cached_id}")
+            _store_campaign_cache(name, cached_id, cached_etag)
+            return cached_id
+
         # Log the response details before raising error
         logging.info(f"GET campaigns response status: {response.status_code}")
         if response.status_code != 200:
@@ -62,24 +330,26 @@ def get_or_create_campaign():
         
         response.raise_for_status()
         
-        campaigns = response.json()
+        campaigns = orjson.loads(response.content)
+        campaigns_etag = response.headers.get('ETag')
         logging.info(f"Found {len(campaigns)} campaigns in lemlist")
-        
+
         for campaign in campaigns:
-            if campaign.get('name') == CAMPAIGN_NAME:
-                CAMPAIGN_ID = campaign.get('_id')
-                logging.info(f"Found existing campaign '{CAMPAIGN_NAME}' with ID: {CAMPAIGN_ID}")
-                return CAMPAIGN_ID
-        
-        # 2. Campaign doesn't exist, create it
-        logging.info(f"Campaign '{CAMPAIGN_NAME}' not found. Creating new campaign...")
-        create_payload = {"name": CAMPAIGN_NAME}
+            if campaign.get('name') == name:
+                campaign_id = campaign.get('_id')
+                logging.info(f"Found existing campaign '{name}' with ID: {campaign_id}")
+                _store_campaign_cache(name, campaign_id, campaigns_etag)
+                return campaign_id
+
+        # 3. Campaign doesn't exist, create it
+        logging.info(f"Campaign '{name}' not found. Creating new campaign...")
+        create_payload = {"name": name}
         logging.info(f"Create campaign payload: {create_payload}")
         
-        create_response = requests.post(
+        create_response = LEMLIST_SESSION.post(
             'https://api.lemlist.com/api/campaigns',
             json=create_payload,
-            auth=auth
+            timeout=LEMLIST_TIMEOUT
         )
         
         logging.info(f"POST campaign response status: {create_response.status_code}")
@@ -88,176 +358,162 @@ def get_or_create_campaign():
         
         create_response.raise_for_status()
         
-        new_campaign = create_response.json()
-        CAMPAIGN_ID = new_campaign.get('_id')
-        logging.info(f"Successfully created campaign '{CAMPAIGN_NAME}' with ID: {CAMPAIGN_ID}")
-        return CAMPAIGN_ID
+        new_campaign = orjson.loads(create_response.content)
+        campaign_id = new_campaign.get('_id')
+        logging.info(f"Successfully created campaign '{name}' with ID: {campaign_id}")
+        _store_campaign_cache(name, campaign_id)
+        return campaign_id
         
     except requests.exceptions.RequestException as e:
         logging.error(f"Error while checking/creating campaign: {e}")
         raise
 
+
+def _send_lead_to_lemlist(business_email, lemlist_payload):
+    """
+    Creates a contact in the lemlist campaign. Runs on a background worker
+    thread; errors are logged rather than surfaced to the webhook caller.
+    """
+    # Ensure campaign exists and get its ID
+    campaign_id = get_or_create_campaign()
+
+    # Construct the specific API endpoint URL required by lemlist
+    lemlist_api_url = f"https://api.lemlist.com/api/campaigns/{campaign_id}/leads/{business_email}"
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"📍 API URL: {lemlist_api_url}")
+        logger.debug(f"📦 Payload being sent to lemlist:")
+        for key, value in lemlist_payload.items():
+            logger.debug(f"   {key}: {value}")
+
+    response = LEMLIST_SESSION.post(lemlist_api_url, json=lemlist_payload, timeout=LEMLIST_TIMEOUT)
+
+    if response.status_code == 404:
+        # The cached campaign was likely deleted in lemlist. Invalidate the
+        # memoized/persisted ID, re-resolve (recreating if needed) and retry.
+        logging.warning(f"Campaign {campaign_id} returned 404 - invalidating cached ID and retrying")
+        _campaign_id.cache_clear()
+        try:
+            os.remove(CAMPAIGN_CACHE_FILE)
+        except OSError:
+            pass
+        campaign_id = get_or_create_campaign()
+        lemlist_api_url = f"https://api.lemlist.com/api/campaigns/{campaign_id}/leads/{business_email}"
+        response = LEMLIST_SESSION.post(lemlist_api_url, json=lemlist_payload, timeout=LEMLIST_TIMEOUT)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"📥 Response Headers: {dict(response.headers)}")
+        logger.debug(f"📥 Response Body: {response.text}")
+
+    # Raise an exception for bad status codes (4xx or 5xx)
+    response.raise_for_status()
+
+    # Single INFO summary per delivered lead
+    logger.info(
+        f"✅ Contact created in lemlist: email={business_email} "
+        f"campaign={CAMPAIGN_NAME} status={response.status_code}"
+    )
+
+
+# Start the batcher at import so the queue drains under any WSGI server.
+# A daemon thread so the interpreter can still exit cleanly.
+threading.Thread(target=_batcher, name="lead-batcher", daemon=True).start()
+
+# Drain queued leads during ASGI lifespan shutdown: after_serving runs
+# once the server has stopped accepting connections, so this doesn't
+# fight gunicorn/uvicorn for the SIGTERM signal or suspend the event
+# loop mid-request. The blocking flush runs on an executor thread.
+@app.after_serving
+async def _drain_lead_queue_on_shutdown():
+    await asyncio.get_running_loop().run_in_executor(None, _drain_lead_queue)
+
+
 # --- Main Webhook Endpoint ---
 @app.route('/rb2b-webhook', methods=['POST'])
-def rb2b_webhook_receiver():
+async def rb2b_webhook_receiver():
     """
     Receives visitor data from RB2B webhook, processes it,
     and creates a new contact in a specific lemlist campaign.
     """
-    logging.info("=" * 80)
-    logging.info("🎯 WEBHOOK REQUEST RECEIVED")
-    logging.info("=" * 80)
-    
-    # Log request metadata
-    logging.info(f"📍 Request Method: {request.method}")
-    logging.info(f"📍 Request URL: {request.url}")
-    logging.info(f"📍 Request Path: {request.path}")
-    logging.info(f"📍 Remote Address: {request.remote_addr}")
-    logging.info(f"📍 User Agent: {request.headers.get('User-Agent', 'Unknown')}")
-    logging.info(f"📍 Content Type: {request.headers.get('Content-Type', 'Unknown')}")
-    
-    # Log all headers (for debugging)
-    logging.info("📋 Request Headers:")
-    for header, value in request.headers.items():
-        logging.info(f"   {header}: {value}")
-
     # 1. Receive and Parse Data from RB2B
     try:
-        logging.info("🔄 Step 1: Parsing request body...")
-        rb2b_data = request.get_json()
-        
+        rb2b_data = await request.get_json()
+
         if not rb2b_data:
-            logging.error("❌ Request body is empty or not JSON.")
+            logger.error("❌ Request body is empty or not JSON.")
             return jsonify({"status": "error", "message": "Invalid request data"}), 400
-        
-        logging.info("✅ Successfully parsed JSON data")
-        logging.info(f"📦 Raw RB2B Data ({len(rb2b_data)} fields):")
-        for key, value in rb2b_data.items():
-            logging.info(f"   {key}: {value}")
-            
+
+        # Valid JSON that isn't an object (e.g. a list or number) would
+        # blow up on .get() below; reject it here instead.
+        if not isinstance(rb2b_data, dict):
+            logger.error(f"❌ Request body is not a JSON object: {type(rb2b_data).__name__}")
+            return jsonify({"status": "error", "message": "Invalid request data"}), 400
+
     except Exception as e:
-        logging.error(f"❌ Could not parse JSON data from request: {e}")
-        logging.error(f"   Raw request data: {request.data}")
+        logger.error(f"❌ Could not parse JSON data from request: {e}")
+        logger.error(f"   Raw request data: {await request.get_data()}")
         return jsonify({"status": "error", "message": "Failed to parse JSON"}), 400
 
-    # 2. Extract and Validate Essential Data
-    logging.info("🔄 Step 2: Extracting and validating email...")
-    
+    # 2. Extract and Validate Essential Data, before any logging or
+    # mapping: RB2B is known to send partial rows without emails, and
+    # those should be skipped as cheaply as possible.
     # Try multiple field name variations that RB2B might send
     work_email = rb2b_data.get("WorkEmail")
     business_email_field = rb2b_data.get("Business Email")
     email_field = rb2b_data.get("email")
-    
-    logging.info(f"   WorkEmail field: {work_email}")
-    logging.info(f"   Business Email field: {business_email_field}")
-    logging.info(f"   email field: {email_field}")
-    
+
     business_email = work_email or business_email_field or email_field
-    
+
     if not business_email:
-        logging.warning("❌ No email found in any field - skipping lead")
-        logging.warning("   Checked fields: WorkEmail, Business Email, email")
+        logger.warning("❌ No email found - skipping lead (checked: WorkEmail, Business Email, email)")
         return jsonify({"status": "skipped", "message": "Missing required field: email"}), 200
-    
-    logging.info(f"✅ Email found: {business_email}")
 
-    # 3. Data Mapping: Map RB2B fields to lemlist fields
-    logging.info("🔄 Step 3: Mapping RB2B fields to lemlist format...")
-    
-    # Standard lemlist fields + custom fields for additional RB2B data
-    lemlist_payload = {
-        "firstName": rb2b_data.get("FirstName") or rb2b_data.get("First Name"),
-        "lastName": rb2b_data.get("LastName") or rb2b_data.get("Last Name"),
-        "linkedinUrl": rb2b_data.get("LinkedIn URL") or rb2b_data.get("LinkedInUrl"),
-        "jobTitle": rb2b_data.get("Title") or rb2b_data.get("jobTitle"),
-        "companyName": rb2b_data.get("CompanyName") or rb2b_data.get("Company Name"),
-        "companyWebsite": rb2b_data.get("Website") or rb2b_data.get("companyWebsite"),
-        "companyIndustry": rb2b_data.get("Industry") or rb2b_data.get("companyIndustry"),
-        "companySize": rb2b_data.get("EstimatedEmployeeCount") or rb2b_data.get("Employee Count"),
-        "city": rb2b_data.get("City"),
-        "state": rb2b_data.get("State"),
-        # Custom fields for additional RB2B data
-        "zipcode": rb2b_data.get("Zipcode") or rb2b_data.get("zipcode"),
-        "estimatedRevenue": rb2b_data.get("EstimateRevenue") or rb2b_data.get("Estimate Revenue")
-    }
-    
-    logging.info(f"📋 Field mapping (before cleanup):")
-    for key, value in lemlist_payload.items():
-        status = "✅" if value else "⚠️ (empty)"
-        logging.info(f"   {key}: {value} {status}")
-    
-    # Remove None values to keep payload clean
-    lemlist_payload = {k: v for k, v in lemlist_payload.items() if v is not None}
-    
-    logging.info(f"✅ Final payload has {len(lemlist_payload)} fields: {list(lemlist_payload.keys())}")
-    
-    # 4. Create Contact in lemlist
-    try:
-        logging.info("🔄 Step 4: Getting campaign ID...")
-        # Ensure campaign exists and get its ID
-        campaign_id = get_or_create_campaign()
-        logging.info(f"✅ Campaign ID obtained: {campaign_id}")
-        
-        # Construct the specific API endpoint URL required by lemlist
-        lemlist_api_url = f"https://api.lemlist.com/api/campaigns/{campaign_id}/leads/{business_email}"
-        
-        logging.info("🔄 Step 5: Preparing lemlist API request...")
-        logging.info(f"📍 API URL: {lemlist_api_url}")
-        logging.info(f"📦 Payload being sent to lemlist:")
+    # Drop retried/duplicate webhooks for an email we handled recently
+    with SEEN_LOCK:
+        if business_email in SEEN_EMAILS:
+            logger.info(f"🔁 Duplicate webhook for {business_email} - skipping")
+            return jsonify({"status": "duplicate", "message": "Lead already processed recently"}), 200
+        SEEN_EMAILS[business_email] = True
+
+    # Per-request metadata and per-field dumps are DEBUG-only: at INFO
+    # they were ~20+ log records per webhook on the hot path.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🎯 WEBHOOK REQUEST RECEIVED")
+        logger.debug(f"📍 Request Method: {request.method}")
+        logger.debug(f"📍 Request URL: {request.url}")
+        logger.debug(f"📍 Request Path: {request.path}")
+        logger.debug(f"📍 Remote Address: {request.remote_addr}")
+        logger.debug("📋 Request Headers:")
+        for header, value in request.headers.items():
+            logger.debug(f"   {header}: {value}")
+        logger.debug(f"📦 Raw RB2B Data ({len(rb2b_data)} fields):")
+        for key, value in rb2b_data.items():
+            logger.debug(f"   {key}: {value}")
+
+    # 3. Data Mapping: Map RB2B fields to lemlist fields with the mapper
+    # compiled from FIELD_ALIASES at import; the first alias present wins
+    # and missing fields are never added, so no cleanup pass is needed.
+    lemlist_payload = _map_rb2b_fields(rb2b_data)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"📋 Mapped {len(lemlist_payload)} field(s):")
         for key, value in lemlist_payload.items():
-            logging.info(f"   {key}: {value}")
-
-        # lemlist uses Basic Authentication with EMPTY username and API key as password
-        # This creates the format ":APIKEY" as required by lemlist docs
-        auth = ('', LEMLIST_API_KEY)
-
-        headers = {
-            "Content-Type": "application/json"
-        }
-
-        logging.info(f"🚀 Sending POST request to lemlist for: {business_email}")
-        response = requests.post(lemlist_api_url, json=lemlist_payload, auth=auth, headers=headers)
-
-        logging.info(f"📥 Response received from lemlist")
-        logging.info(f"   Status Code: {response.status_code}")
-        logging.info(f"   Response Headers: {dict(response.headers)}")
-        logging.info(f"   Response Body: {response.text}")
-
-        # 5. Handle lemlist API Response
-        # Raise an exception for bad status codes (4xx or 5xx)
-        response.raise_for_status() 
-
-        logging.info("=" * 80)
-        logging.info(f"✅ SUCCESS! Contact created in lemlist")
-        logging.info(f"   Email: {business_email}")
-        logging.info(f"   Campaign: {CAMPAIGN_NAME}")
-        logging.info(f"   Response: {response.json()}")
-        logging.info("=" * 80)
-        return jsonify({"status": "success", "message": "Contact created in lemlist"}), 201
-
-    except requests.exceptions.HTTPError as http_err:
-        logging.error("=" * 80)
-        logging.error(f"❌ HTTP ERROR from lemlist API")
-        logging.error(f"   Error: {http_err}")
-        logging.error(f"   Status Code: {response.status_code}")
-        logging.error(f"   Response Body: {response.text}")
-        logging.error(f"   Email attempted: {business_email}")
-        logging.error(f"   Campaign ID: {campaign_id}")
-        logging.error("=" * 80)
-        return jsonify({"status": "error", "message": "Failed to create contact in lemlist", "details": response.text}), 502
-    except requests.exceptions.RequestException as req_err:
-        logging.error("=" * 80)
-        logging.error(f"❌ NETWORK ERROR connecting to lemlist")
-        logging.error(f"   Error: {req_err}")
-        logging.error("=" * 80)
-        return jsonify({"status": "error", "message": "Network error connecting to lemlist"}), 503
-    except Exception as e:
-        logging.error("=" * 80)
-        logging.error(f"❌ UNEXPECTED ERROR occurred")
-        logging.error(f"   Error: {e}")
-        logging.error(f"   Error Type: {type(e).__name__}")
-        logging.error("=" * 80)
-        return jsonify({"status": "error", "message": "An internal server error occurred"}), 500
+            logger.debug(f"   {key}: {value}")
+
+    # 4. Queue the lead for background delivery to lemlist
+    try:
+        LEAD_Q.put_nowait((business_email, lemlist_payload))
+    except queue.Full:
+        # The 503 asks RB2B to retry; forget the email so the retry
+        # isn't rejected as a duplicate of a lead we never queued.
+        with SEEN_LOCK:
+            SEEN_EMAILS.pop(business_email, None)
+        logger.error(f"❌ Lead queue is full - dropping lead: {business_email}")
+        return jsonify({"status": "error", "message": "Server busy, lead queue is full"}), 503
+
+    # Single INFO summary per webhook
+    logger.info(f"✅ Lead queued: email={business_email} fields={len(lemlist_payload)}")
+    return jsonify({"status": "queued", "message": "Lead accepted for processing"}), 202
 
 
 # --- Main Execution Block ---
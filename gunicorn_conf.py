@@ -0,0 +1,8 @@
+import os
+
+# uvicorn workers run the Quart (ASGI) app: one event loop per worker
+# serves many in-flight requests instead of one thread per request.
+worker_class = 'uvicorn.workers.UvicornWorker'
+workers = (os.cpu_count() or 1) * 2
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"